@@ -1,6 +1,19 @@
-from DataImporter import *
+from DataIO import DataImport, UnifiedData
+
+class UnifiedDataCV(UnifiedData):
+    UNIT_TABLE = {
+        'V' : 1E0,
+        'mV': 1E-3,
+        'uV': 1E-6,
+        'A' : 1E0,
+        'mA': 1E-3,
+        'uA': 1E-6,
+        'pA': 1E-9,
+        'nA': 1E-12,
+        'fA': 1E-15
+    }
+    MULTIPLIER_KEY = 'conversionMulti'
 
-class UnifiedDataCV:
     def __init__(self, obj):
         """
         Initializes UnifiedDataCV object with given data object from DataImport at DataImporter.py.
@@ -11,11 +24,13 @@ class UnifiedDataCV:
         Attributes:
         - raw_data: Raw data DataFrame.
         - headers: List of dictionaries containing header information.
+        - titles: List of header titles.
+        - multipliers: Array of SI-conversion multipliers, NaN for unknown units.
         - uni_data: DataFrame with converted units.
         """
     
         self.raw_data = obj.data
-        self.headers = self.splitter(self.raw_data.columns.tolist())
+        self.split_headers(self.raw_data.columns.tolist())
         self.uni_data = self.SIConverter(self.raw_data)
         return
     
@@ -29,30 +44,8 @@ class UnifiedDataCV:
         Returns:
         - headers_list: List of dictionaries containing header information with SI-converison multiplier.
         """
-        unitConverisonList = {
-            'V' : 1E0,
-            'mV': 1E-3,
-            'uV': 1E-6,
-            'A' : 1E0,
-            'mA': 1E-3,
-            'uA': 1E-6,
-            'pA': 1E-9,
-            'nA': 1E-12,
-            'fA': 1E-15
-        }
-
-        headers_list = []
-        for items in input:
-            if '.' in items:
-                items = items.split('.')[0]
-            
-            dummy = {
-                'title'             : items.split(' /')[0],
-                'unit'              : items.split(' /')[1],
-                'conversionMulti'   : unitConverisonList.get(items.split(' /')[1], None)
-            }
-            headers_list.append(dummy)
-        return headers_list
+        self.split_headers(input)
+        return self.headers
     
     def SIConverter(self, RawData):
         """
@@ -64,16 +57,7 @@ class UnifiedDataCV:
         Returns:
         - df: DataFrame with converted units.
         """
-        df = RawData
-        for  i in range(len(df.columns)):
-            dummy = df.iloc[:, i]
-            multi = self.headers[i]['conversionMulti']
-            if not multi is None:
-                df.iloc[:, i] = dummy * multi
-            else:
-                print("Warning! No matching units found.")
-        df.columns = [item['title'] for item in self.headers]
-        return df
+        return self.convert_to_si_units(RawData)
 
 if __name__ == "__main__":
     path = './CV/Demo-3.xlsx'
@@ -18,18 +18,65 @@ ADDITONAL NOTES:
 """
 
 ##### Imports ######
+import numpy as np
 import pandas as pd
 import os
-from typing import Tuple
+import re
+import hashlib
+import importlib.util
+import tempfile
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+##### Constants #####
+# Parsed Excel workbooks are pickled here, keyed by a hash of the file content
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'eca')
+# Least recently used pickles are deleted once the cache grows past this size
+CACHE_MAX_BYTES = 512 * 1024**2
+
+# Native parsers are used when installed, otherwise pandas falls back to its default engines
+# Rust-backed xlsx/xls reader, only probed for, pandas imports it itself
+EXCEL_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else None
+
+try:
+    import pyarrow # Multithreaded Arrow CSV reader, also writes Parquet
+    import pyarrow.parquet
+    CSV_ENGINE = 'pyarrow'
+    TABLE_FORMAT = 'parquet'
+except ImportError:
+    CSV_ENGINE = None
+    TABLE_FORMAT = 'csv'
+
+# XlsxWriter streams cells to the file instead of building an openpyxl object tree
+EXCEL_WRITER_ENGINE = 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') else 'openpyxl'
+
+# Headers look like "<title> /<unit>", pandas appends ".<n>" to duplicated ones
+HEADER_PATTERN = re.compile(r'(.*?) /(\w+)(?:\.\d+)?')
 
 ##### Classes #####
 class DataImport:
-    def __init__(self, path: str) -> None:
+    def __init__(
+        self,
+        path: str,
+        use_cache: bool = True,
+        chunksize: Optional[int] = None,
+        usecols: Optional[Any] = None,
+        dtype: Optional[Any] = None,
+        digest: Optional[str] = None
+    ) -> None:
         '''
         Initializes DataImport object with given file path.
 
         Args:
         - path (str): Path to the data file.
+        - use_cache (bool): Reuse the pickled copy of a previously parsed Excel file if its content is unchanged.
+        - chunksize (int, optional): Read CSV files in chunks of this many rows to bound peak memory.
+        - usecols (optional): Columns to load, forwarded to pandas. Unused columns are skipped while parsing.
+        - dtype (optional): Column dtype(s), forwarded to pandas. For example np.float32 skips type inference.
+        - digest (str, optional): content_digest of the file, if the caller already has it. Saves hashing the file again for the cache.
 
         Attributes:
         - file_path (str): Path to the data file.
@@ -41,8 +88,54 @@ class DataImport:
         '''
 
         self.file_path = path
+        self.use_cache = use_cache
+        self.chunksize = chunksize
+        self.usecols = usecols
+        self.dtype = dtype
+        self.digest = digest
         self.file_name, self.file_type = self.path2name_extension(self.file_path)
         self.data, self.status, self.status_message = self.LoadData()
+
+    @classmethod
+    def load_many(cls, paths: List[str], **kwargs) -> List['DataImport']:
+        """
+        Loads several data files concurrently on a thread pool.
+
+        Args:
+        - paths (List[str]): Paths to the data files.
+        - kwargs: Keyword arguments passed to every DataImport.
+
+        Returns:
+        - List[DataImport]: One DataImport object per path, in the same order as paths.
+        """
+
+        if not paths:
+            return []
+        # File reads and the native parsers release the GIL, so threads overlap the I/O of each file
+        with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+            return list(executor.map(lambda path: cls(path, **kwargs), paths))
+
+    @staticmethod
+    def peek_headers(path: str) -> List[str]:
+        """
+        Reads only the header row of a data file, without loading the data.
+
+        Args:
+        - path (str): Path to the data file.
+
+        Returns:
+        - List[str]: Column headers, named as pandas would name them when loading the whole file.
+        """
+
+        match os.path.splitext(path)[1][1:]:
+            case 'xlsx' | 'xls':
+                return pd.read_excel(path, nrows=0, engine=EXCEL_ENGINE).columns.tolist()
+            case 'csv':
+                # nrows=0 stops the parser right after the header line
+                return pd.read_csv(path, nrows=0).columns.tolist()
+            case _:
+                raise ValueError(f"Unsupported file format: '{path}'.")
+
     def path2name_extension(self, path: str) -> Tuple[str, str]:
         """
         Extracts file name and extension from the given file path.
@@ -59,6 +152,121 @@ class DataImport:
         return (name, type)
         return [name, type]
 
+    def cache_path(self) -> str:
+        """
+        Builds the cache file path of the data file from a hash of its content.
+
+        Returns:
+        - cache_path (str): Path to the pickled DataFrame inside CACHE_DIR.
+        """
+
+        # The reader engine, column selection and dtypes change the parsed result, so they are part of the key
+        if self.digest is None:
+            self.digest = self.content_digest(self.file_path)
+        settings = repr((EXCEL_ENGINE, self.usecols, self.dtype))
+        key = hashlib.blake2b((self.digest + settings).encode(), digest_size=16).hexdigest()
+        return os.path.join(CACHE_DIR, key + '.pkl')
+
+    @staticmethod
+    def content_digest(path: str) -> str:
+        """
+        Hashes the content of a file, so anything derived from it can be cached regardless of its name or timestamp.
+
+        Args:
+        - path (str): Path to the file.
+
+        Returns:
+        - str: Hex digest.
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def read_excel_cached(self) -> pd.DataFrame:
+        """
+        Reads an Excel file, reusing the pickled DataFrame from an earlier parse of the same content.
+
+        Returns:
+        - data (DataFrame): Loaded data from the file.
+        """
+
+        cache_path = self.cache_path()
+        if os.path.exists(cache_path):
+            try:
+                df = pd.read_pickle(cache_path)
+                os.utime(cache_path) # Recently used entries are pruned last
+                return df
+            except Exception:
+                pass # Unreadable cache entry, parse the workbook again below
+
+        df = pd.read_excel(self.file_path, engine=EXCEL_ENGINE, usecols=self.usecols, dtype=self.dtype)
+        temp_path = None
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Write to a temporary file first so an interrupted run never leaves a truncated pickle.
+            # The name is unique per writer, concurrent loads of the same workbook never share it
+            with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix='.tmp', delete=False) as temp_file:
+                temp_path = temp_file.name
+                df.to_pickle(temp_file, protocol=5)
+            os.replace(temp_path, cache_path)
+            temp_path = None
+            self.prune_cache()
+        except OSError:
+            pass # Caching is best-effort, the data is already loaded
+        finally:
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+        return df
+
+    @staticmethod
+    def prune_cache(max_bytes: Optional[int] = None) -> None:
+        """
+        Deletes the least recently used cache entries until the cache fits in max_bytes.
+
+        Args:
+        - max_bytes (int, optional): Size limit of CACHE_DIR in bytes, CACHE_MAX_BYTES by default.
+        """
+
+        if max_bytes is None:
+            max_bytes = CACHE_MAX_BYTES
+        entries = []
+        for entry in os.scandir(CACHE_DIR):
+            if entry.name.endswith('.pkl'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue # Removed by another process in the meantime
+            total -= size
+
+    def read_csv_chunked(self) -> pd.DataFrame:
+        """
+        Reads a CSV file chunk by chunk, so the parser never holds more than one chunk of text.
+        Columns keep the parsed dtype (or the one passed as dtype), so results match an unchunked read.
+
+        Returns:
+        - data (DataFrame): Loaded data from the file.
+        """
+
+        chunks = []
+        # The pyarrow engine does not support chunked reading, so the default engine is used here
+        for chunk in pd.read_csv(self.file_path, chunksize=self.chunksize, usecols=self.usecols, dtype=self.dtype):
+            chunks.append(chunk)
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
     def LoadData(self):
         """
         Loads data from the file based on its extension.
@@ -81,9 +289,20 @@ class DataImport:
             # Load data based on file extension # Neeeedddd Errorr typings
             match self.file_type:
                 case 'xlsx' | 'xls':
-                    df = pd.read_excel(self.file_path)
+                    if self.use_cache:
+                        df = self.read_excel_cached()
+                    else:
+                        df = pd.read_excel(self.file_path, engine=EXCEL_ENGINE, usecols=self.usecols, dtype=self.dtype)
                 case 'csv':
-                    df = pd.read_csv(self.file_path)
+                    if self.chunksize:
+                        df = self.read_csv_chunked()
+                    else:
+                        # The pyarrow engine only selects columns by name, positions need the default engine
+                        by_name = self.usecols is None or (
+                            isinstance(self.usecols, (list, tuple)) and all(isinstance(col, str) for col in self.usecols)
+                        )
+                        engine = CSV_ENGINE if by_name else None
+                        df = pd.read_csv(self.file_path, engine=engine, usecols=self.usecols, dtype=self.dtype)
                 case _:
                     # Invalid file format
                     status = 400
@@ -106,33 +325,325 @@ class DataImport:
             message = status_messages[status]
             return None, status, message
         
+class UnifiedData:
+    """
+    Base class for experiment data with "<title> /<unit>" headers. Experiment classes set UNIT_TABLE.
+    """
+
+    # Unit code -> SI-conversion multiplier, defined by every experiment class
+    UNIT_TABLE: Mapping[str, float] = {}
+    # Key of the multiplier in the header dictionaries
+    MULTIPLIER_KEY: str = 'conversion_multiplier'
+    # Raise on unknown units instead of warning and leaving those columns unscaled
+    STRICT_UNITS: bool = False
+    # dtype of the converted data and everything derived from it. float64 keeps exported values as typed,
+    # batch callers can opt into float32 to halve memory and double SIMD throughput
+    precision: str = 'float64'
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Frozen, so the parse_header cache cannot go stale behind a later edit
+        cls.UNIT_TABLE = MappingProxyType(dict(cls.UNIT_TABLE))
+
+    @classmethod
+    @lru_cache(maxsize=512)
+    def parse_header(cls, header: str) -> Tuple[str, str, Optional[float]]:
+        """
+        Parses a single header into title, unit, and SI-conversion multiplier.
+        The cache is shared by all experiment classes, keyed on (class, header).
+
+        Args:
+        - header (str): Header name.
+
+        Returns:
+        - Tuple: (title (str), unit (str), multiplier (float or None for unknown units))
+        """
+
+        match = HEADER_PATTERN.fullmatch(header)
+        if match is None:
+            raise ValueError(f"Header '{header}' is not in '<title> /<unit>' format.")
+        return match[1], match[2], cls.UNIT_TABLE.get(match[2])
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def parse_headers(cls, headers: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[Optional[float], ...]]:
+        """
+        Parses a whole header row, cached so files with the same columns are parsed only once.
+
+        Args:
+        - headers (Tuple[str, ...]): Header names.
+
+        Returns:
+        - Tuple: (titles, units, multipliers), one entry per header.
+        """
+
+        return tuple(zip(*map(cls.parse_header, headers))) or ((), (), ())
+
+    def split_headers(self, input_headers: List[str]) -> None:
+        """
+        Splits headers into title and unit, and finds their SI-conversion multiplier.
+        Results are stored as parallel titles, units, and multipliers, so the conversion is one array operation.
+
+        Args:
+        - input_headers (List[str]): Header names.
+        """
+
+        titles, units, multipliers = self.parse_headers(tuple(input_headers))
+        self.titles: List[str] = list(titles)
+        self.units: List[str] = list(units)
+        self.multipliers: np.ndarray = np.array(multipliers, dtype=np.float64)
+
+    @property
+    def headers(self) -> List[Dict[str, Union[str, float, None]]]:
+        """
+        Title, unit, and multiplier of every header as dictionaries, built only when asked for.
+
+        Returns:
+        - List[Dict]: One dictionary per column, multiplier is None for unknown units.
+        """
+
+        return [
+            {
+                'title': title,
+                'unit': unit,
+                self.MULTIPLIER_KEY: None if np.isnan(multi) else float(multi)
+            }
+            for title, unit, multi in zip(self.titles, self.units, self.multipliers)
+        ]
+
+    def si_multipliers(self) -> np.ndarray:
+        """
+        Returns the SI-conversion multipliers with unknown units left unscaled, or raises if STRICT_UNITS is set.
+
+        Returns:
+        - np.ndarray: Multiplier of every column, 1.0 where the unit is unknown.
+        """
+
+        multipliers = self.multipliers
+        missing = np.isnan(multipliers)
+        if missing.any():
+            # One warning per file instead of a print per column
+            unknown = sorted({unit for unit, is_missing in zip(self.units, missing) if is_missing})
+            if self.STRICT_UNITS:
+                raise ValueError(f"No matching units found for: {', '.join(unknown)}.")
+            warnings.warn(f"No matching units found for: {', '.join(unknown)}. These columns are left unscaled.")
+            multipliers = np.where(missing, 1.0, multipliers)
+        return multipliers
+
+    @staticmethod
+    def numeric_array(raw_data: pd.DataFrame) -> np.ndarray:
+        """
+        Returns the values of the raw data, without a copy when all columns share one numeric dtype.
+        The unit-conversion ufuncs cast while they multiply, so no float64 copy is made up front.
+
+        Args:
+        - raw_data (DataFrame): Raw data.
+
+        Returns:
+        - np.ndarray: Raw values, shape (rows, columns).
+        """
+
+        arr = raw_data.to_numpy()
+        if arr.dtype.kind not in 'iuf':
+            # Mixed or non-numeric columns, fails here as before if a value is not a number
+            arr = arr.astype(np.float64)
+        return arr
+
+    def convert_to_si_units(self, raw_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converts the raw data to SI units with a single broadcast multiply.
+
+        Args:
+        - raw_data (DataFrame): Raw data, columns in the order of the split headers.
+
+        Returns:
+        - DataFrame: Data in SI units, columns named by header titles.
+        """
+
+        multipliers = self.si_multipliers()
+        # The product is written straight into the output dtype
+        arr = self.numeric_array(raw_data)
+        converted = np.empty(arr.shape, dtype=self.precision)
+        np.multiply(arr, multipliers[np.newaxis, :], out=converted)
+        # The buffer is fresh, so pandas can own it instead of copying it (the default under copy-on-write)
+        return pd.DataFrame(converted, index=raw_data.index, columns=self.titles, copy=False)
+
 def DataExporterGCD(levels_info, levels_details, file_path, number_of_rows=100):
+    StreamExporterGCD(zip(levels_info, levels_details), file_path, number_of_rows)
+    return
+
+def StreamExporterGCD(level_results, file_path, number_of_rows=100):
+    """
+    Writes each level to the Details sheet as soon as it is produced, then drops it.
+
+    Args:
+    - level_results: Iterable of (level information, level details) pairs, e.g. GCD.iter_level_results.
+    - file_path: Output name, ' Results.xlsx' is appended.
+    - number_of_rows: Maximum number of rows written per level.
+
+    Returns:
+    - levels_info: List of level information dictionaries, in level order.
+    """
     file_path = file_path + ' Results.xlsx'
     
-    df_summary = pd.DataFrame(levels_info)
+    levels_info = []
     
-    
-    with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-        
-        df_summary.to_excel(writer, index=False, sheet_name='Summary')
+    with pd.ExcelWriter(file_path, engine=EXCEL_WRITER_ENGINE) as writer:
         
-        workbook = writer.book
+        # Summary stays the first sheet, it is filled once every level has been written
+        pd.DataFrame().to_excel(writer, index=False, sheet_name='Summary')
         
-        for index, items in enumerate(levels_details):
+        for index, (info, items) in enumerate(level_results):
             
-            if not len(items) <= number_of_rows:
-                step_size = max(len(items) // number_of_rows, 1)
-                items = items.iloc[::step_size]
+            levels_info.append(info)
             
-            items = items.head(number_of_rows)
+            if len(items) > number_of_rows:
+                # Exactly number_of_rows rows spread evenly from the first to the last one, in one gather
+                rows = np.linspace(0, len(items) - 1, number_of_rows).astype(np.int64)
+                items = items.take(rows)
             
             items.to_excel(writer, index=False, sheet_name='Details', startcol=7*index, startrow=1)
             
-            sheet = workbook['Details']
+            sheet = writer.sheets['Details']
             
-            sheet.cell(row=1, column=7*index + 1, value='Level ID')
-            sheet.cell(row=1, column=7*index + 2, value=index+1)
-    return
+            if EXCEL_WRITER_ENGINE == 'xlsxwriter':
+                # Zero-based row/column
+                sheet.write(0, 7*index, 'Level ID')
+                sheet.write(0, 7*index + 1, index+1)
+            else:
+                sheet.cell(row=1, column=7*index + 1, value='Level ID')
+                sheet.cell(row=1, column=7*index + 2, value=index+1)
+        
+        write_summary(writer, levels_info)
+    return levels_info
+
+def ExportGCD(level_results, file_path, format='xlsx', number_of_rows=100):
+    """
+    Exports level results either as a downsampled workbook or as a full-resolution table.
+
+    Args:
+    - level_results: Iterable of (level information, level details) pairs, e.g. GCD.iter_level_results.
+    - file_path: Output name, ' Results.<extension>' is appended.
+    - format: 'xlsx' for StreamExporterGCD, 'table' for TableExporterGCD.
+    - number_of_rows: Maximum number of rows written per level, only used by 'xlsx'.
+
+    Returns:
+    - levels_info: List of level information dictionaries, in level order.
+    """
+    match format:
+        case 'xlsx':
+            return StreamExporterGCD(level_results, file_path, number_of_rows)
+        case 'table':
+            return TableExporterGCD(level_results, file_path)
+        case _:
+            raise ValueError(f"Unsupported export format: '{format}'.")
+
+def export_path(file_path, format='xlsx'):
+    """
+    Returns the path ExportGCD writes to for the given output name and format.
+    """
+    return file_path + ' Results.' + (TABLE_FORMAT if format == 'table' else 'xlsx')
+
+def TableExporterGCD(level_results, file_path):
+    """
+    Writes every level at full resolution to one long-form table, with a Level ID column.
+    Parquet when pyarrow is installed, CSV otherwise. Levels can be split again with groupby('Level ID').
+    Each level is appended as soon as it is produced, then dropped.
+    The level summaries go to a second file in the same format, one row per level, named ' Summary.<ext>'.
+
+    Args:
+    - level_results: Iterable of (level information, level details) pairs, e.g. GCD.iter_level_results.
+    - file_path: Output name, ' Results.parquet' or ' Results.csv' is appended.
+
+    Returns:
+    - levels_info: List of level information dictionaries, in level order.
+    """
+    summary_path = file_path + ' Summary.' + TABLE_FORMAT
+    file_path = export_path(file_path, 'table')
+    
+    levels_info = []
+    
+    if TABLE_FORMAT == 'parquet':
+        writer = None
+        try:
+            for index, (info, items) in enumerate(level_results):
+                levels_info.append(info)
+                # One row group per level, appended to the same file
+                table = pyarrow.Table.from_pandas(level_table(index, items), preserve_index=False)
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(file_path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            level_table(0, pd.DataFrame()).to_parquet(file_path, index=False)
+    else:
+        with open(file_path, 'w', newline='') as file:
+            for index, (info, items) in enumerate(level_results):
+                levels_info.append(info)
+                level_table(index, items).to_csv(file, header=(index == 0), index=False)
+            if not levels_info:
+                level_table(0, pd.DataFrame()).to_csv(file, index=False)
+
+    summary = pd.DataFrame(levels_info)
+    if TABLE_FORMAT == 'parquet':
+        summary.to_parquet(summary_path, index=False)
+    else:
+        summary.to_csv(summary_path, index=False)
+    return levels_info
+
+def level_table(index, items):
+    """
+    Prepends the Level ID column to one level's details, for the long-form table.
+    """
+    table = items.reset_index(drop=True)
+    table.insert(0, 'Level ID', np.full(len(table), index + 1, dtype=np.int32))
+    return table
+
+def excel_value(value):
+    """
+    Maps a non-finite float the way DataFrame.to_excel does: infinities as text, NaN as an empty cell.
+
+    Args:
+    - value: Summary value.
+
+    Returns:
+    - The value to write to the cell.
+    """
+    if isinstance(value, (float, np.floating)) and not np.isfinite(value):
+        return None if np.isnan(value) else ('inf' if value > 0 else '-inf')
+    return value
+
+def write_summary(writer, levels_info):
+    """
+    Writes the level summaries to the Summary sheet row by row, without going through DataFrame.to_excel.
+
+    Args:
+    - writer: Open pd.ExcelWriter that already has a Summary sheet.
+    - levels_info: List of level information dictionaries, all with the same keys.
+    """
+    if not levels_info:
+        return
+    columns = list(levels_info[0])
+    sheet = writer.sheets['Summary']
+    
+    if EXCEL_WRITER_ENGINE == 'xlsxwriter':
+        # Same header look as pandas gives the Details sheet
+        header = writer.book.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        sheet.write_row(0, 0, columns, header)
+        for row, info in enumerate(levels_info, 1):
+            sheet.write_row(row, 0, [excel_value(info[column]) for column in columns])
+    else:
+        from openpyxl.styles import Alignment, Border, Font, Side
+        sheet.append(columns)
+        thin = Side(style='thin')
+        for cell in sheet[1]:
+            cell.font = Font(bold=True)
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(horizontal='center', vertical='top')
+        for info in levels_info:
+            sheet.append([excel_value(info[column]) for column in columns])
 
 ##### Functions #####
 if __name__ == "__main__":
@@ -14,10 +14,93 @@ Further Notes:
 - class objects could be merged
 """
 
-from DataIO import DataImport, DataExporterGCD
+from DataIO import DataImport, ExportGCD, UnifiedData
+import numpy as np
 import pandas as pd
-from scipy.integrate import cumulative_trapezoid
-from typing import List, Dict, Union
+import sys
+import warnings
+from typing import List, Dict, Optional, Tuple
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None # Numba is optional, the NumPy implementation below is used without it
+
+
+def battery_quantities_numpy(
+    time: np.ndarray,
+    current: np.ndarray,
+    potential: np.ndarray,
+    capacity_factor: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculates specific capacity, energy density, and power density of all levels at once.
+
+    Args:
+        time (np.ndarray): Time in seconds, shape (rows, levels).
+        current (np.ndarray): Current in amperes, shape (rows, levels).
+        potential (np.ndarray): Potential in volts, shape (rows, levels).
+        capacity_factor (float): 1000 / (3600 * mass), converts A*s to mAh per gram of active material.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Specific capacity (mAh/g), energy density (Wh/kg),
+        and power density (W/kg), each of shape (rows, levels).
+    """
+    # Every step writes into the buffer of the previous one, no temporaries per operation
+    specific_capacity = np.multiply(time, current)
+    np.multiply(specific_capacity, capacity_factor, out=specific_capacity)
+    np.abs(specific_capacity, out=specific_capacity)
+    # Cumulative trapezoid along the rows for every level at once. The steps stay in the data precision,
+    # the running sum is float64 so rounding does not build up over long levels
+    steps = specific_capacity[1:] + specific_capacity[:-1]
+    steps *= potential[1:] - potential[:-1]
+    steps *= 0.5
+    energy_density = np.empty_like(specific_capacity)
+    energy_density[:1] = 0
+    energy_density[1:] = np.cumsum(steps, axis=0, dtype=np.float64)
+    np.abs(energy_density, out=energy_density)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        power_density = np.divide(energy_density, time)
+    np.multiply(power_density, 3600, out=power_density)
+    return specific_capacity, energy_density, power_density
+
+
+if njit is not None:
+    # Only contraction and reciprocal rewrites are allowed, full fastmath would assume the NaN padding away
+    @njit(parallel=True, fastmath={'contract', 'arcp'}, error_model='numpy', cache=True)
+    def battery_quantities_numba(time, current, potential, capacity_factor):
+        levels, rows = time.shape
+        specific_capacity = np.empty_like(time)
+        energy_density = np.empty_like(time)
+        power_density = np.empty_like(time)
+        # Levels are independent, so they are spread over threads, each with its own serial prefix sum
+        for i in prange(levels):
+            cumulative = 0.0
+            for j in range(rows):
+                specific_capacity[i, j] = abs(time[i, j] * current[i, j] * capacity_factor)
+                if j > 0:
+                    cumulative += 0.5 * (specific_capacity[i, j] + specific_capacity[i, j-1]) \
+                        * (potential[i, j] - potential[i, j-1])
+                energy_density[i, j] = abs(cumulative)
+                power_density[i, j] = energy_density[i, j] / time[i, j] * 3600
+        return specific_capacity, energy_density, power_density
+
+    def battery_quantities(
+        time: np.ndarray,
+        current: np.ndarray,
+        potential: np.ndarray,
+        capacity_factor: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Same as battery_quantities_numpy, computed by the Numba kernel on one contiguous row per level.
+        """
+        results = battery_quantities_numba(
+            *(np.ascontiguousarray(values.T) for values in (time, current, potential)),
+            capacity_factor
+        )
+        return tuple(values.T for values in results)
+else:
+    battery_quantities = battery_quantities_numpy
 
 
 class GCDExperimentSpecs:
@@ -38,6 +121,19 @@ class GCDExperimentSpecs:
         self.material_mass = material_mass
         self._validate_inputs()
 
+    def cache_key(self) -> Tuple:
+        """
+        Returns a hashable summary of the experiment settings, for caching analysis results.
+        """
+        return (
+            bool(self.cycle_separated),
+            bool(self.level_separated),
+            self.level_number,
+            tuple(self.level_current_np.tolist()),
+            tuple(self.level_time_np.tolist()),
+            float(self.material_mass)
+        )
+
     def _validate_inputs(self) -> None:
         if self.level_separated and not self.cycle_separated:
             raise ValueError("Levels cannot be separated if cycles are not.")
@@ -45,89 +141,104 @@ class GCDExperimentSpecs:
             raise ValueError("Level number must be a positive integer.")
         if not isinstance(self.material_mass, (int, float)) or self.material_mass <= 0:
             raise ValueError("Active material mass must be a positive number.")
-        if len(self.level_current) != len(self.level_time) != self.level_number:
+        # One array conversion per list, its dtype tells whether every element is a number
+        try:
+            level_current = np.asarray(self.level_current)
+            level_time = np.asarray(self.level_time)
+        except ValueError:
+            raise ValueError("Level currents and times must be flat lists of numbers.") from None
+        if level_current.ndim != 1 or level_time.ndim != 1:
+            raise ValueError("Level currents and times must be flat lists of numbers.")
+        if level_current.size != self.level_number or level_time.size != self.level_number:
             raise ValueError("Level currents and times must have the same length as level number.")
-        if not all(isinstance(x, (int, float)) for x in self.level_current):
+        if level_current.dtype.kind not in 'iuf':
             raise ValueError("All level currents must be numbers.")
-        if not all(x > 0 for x in self.level_time):
+        if level_time.dtype.kind not in 'iuf' or not (level_time > 0).all():
             raise ValueError("All level times must be positive numbers.")
+        # Validated float64 copies, so later code never walks the input lists again
+        self.level_current_np: np.ndarray = level_current.astype(np.float64)
+        self.level_time_np: np.ndarray = level_time.astype(np.float64)
 
 
-class UnifiedDataGCD:
+class UnifiedDataGCD(UnifiedData):
     """
     Class for processing and unifying raw data for GCD (Galvanostatic Charge-Discharge) experiments.
     """
 
-    def __init__(self, raw_data: pd.DataFrame, specs: 'GCDExperimentSpecs') -> None:
+    UNIT_TABLE: Dict[str, float] = {
+        's' : 1E0,
+        'ms': 1E-3,
+        'us': 1E-6,
+        'V' : 1E0,
+        'mV': 1E-3,
+        'uV': 1E-6,
+    }
+    # Unscaled columns would silently corrupt every derived battery quantity
+    STRICT_UNITS: bool = True
+
+    def __init__(
+        self,
+        raw_data: pd.DataFrame,
+        specs: 'GCDExperimentSpecs',
+        precision: Optional[str] = None
+    ) -> None:
         """
         Initializes the UnifiedDataGCD object.
 
         Args:
             raw_data (pd.DataFrame): The raw data to be processed and unified.
             specs (GCDExperimentSpecs): The specifications for the GCD experiment.
+            precision (str, optional): Floating-point dtype of the unified data and every derived quantity, e.g. 'float32'.
+                Defaults to the class precision (float64).
 
         Returns:
             None
         """
+        if precision is not None:
+            try:
+                dtype = np.dtype(precision)
+            except TypeError:
+                dtype = None
+            if dtype is None or dtype.kind != 'f':
+                raise ValueError(f"Precision must be a floating-point dtype such as 'float32' or 'float64', got {precision!r}.")
+            self.precision: str = dtype.name
         self.raw_data: pd.DataFrame = raw_data
-        self.headers: List[Dict[str, Union[str, float, None]]] = self.split_headers(raw_data.columns.tolist())
-        self.unified_data: pd.DataFrame = self.unify_data(
-            self.convert_to_si_units(raw_data),
-            specs
-        )
-        
-    def split_headers(self, input_headers: List[str]) -> List[Dict[str, Union[str, float, None]]]:
-        """
-        Splits the input headers into title and unit, and converts the unit to a conversion multiplier.
+        self.split_headers(raw_data.columns.tolist())
+        self.index: pd.Index = raw_data.index
+        self.unified_array: np.ndarray = self.build_unified(raw_data, specs)
+        self._unified_data: Optional[pd.DataFrame] = None
 
-        Args:
-            input_headers (List[str]): The input headers to be split.
+    @property
+    def unified_data(self) -> pd.DataFrame:
+        """
+        The unified data as a DataFrame, wrapped around unified_array the first time it is asked for.
 
         Returns:
-            List[Dict[str, Union[str, float, None]]]: The split headers with title, unit, and conversion multiplier.
-        """
-        unit_conversion_list: Dict[str, float] = {
-            's' : 1E0,
-            'ms': 1E-3,
-            'us': 1E-6,
-            'V' : 1E0,
-            'mV': 1E-3,
-            'uV': 1E-6,
-        }
+            pd.DataFrame: The unified data.
+        """
+        if self._unified_data is None:
+            self._unified_data = self.to_frame(self.unified_array, self.index)
+        return self._unified_data
 
-        headers_list: List[Dict[str, Union[str, float, None]]] = []
-        for item in input_headers:
-            if '.' in item:
-                item = item.split('.')[0]  
-            
-            title, unit = item.rsplit(' /', 1)
-            headers_list.append({
-                'title': title,
-                'unit': unit,
-                'conversion_multiplier': unit_conversion_list.get(unit, None)
-            })
-        return headers_list
-    
-    def convert_to_si_units(self, raw_data: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def is_unifiable(specs: 'GCDExperimentSpecs') -> bool:
         """
-        Converts the raw data to SI units based on the conversion multipliers.
+        Checks whether the data layout can be unified, warning when it cannot.
+
+        Only cycle- and level-separated data has one (time, potential) column pair per level. Other layouts
+        would need their rows split into levels, which is not implemented.
 
         Args:
-            raw_data (pd.DataFrame): The raw data to be converted.
+            specs (GCDExperimentSpecs): The specifications for the GCD experiment.
 
         Returns:
-            pd.DataFrame: The converted data in SI units.
-        """
-        unit_converted_data: pd.DataFrame = raw_data.copy()
-        for i, col in enumerate(unit_converted_data.columns):
-            multi = self.headers[i]['conversion_multiplier']
-            if multi is not None:
-                unit_converted_data[col] *= multi
-            else:
-                print("Warning! No matching units found.")
-        unit_converted_data.columns = [item['title'] for item in self.headers]
-        return unit_converted_data
-    
+            bool: True if both cycles and levels are separated.
+        """
+        if specs.cycle_separated and specs.level_separated:
+            return True
+        warnings.warn("Only cycle- and level-separated data can be unified, the unified data is left empty.")
+        return False
+
     def unify_data(self, data: pd.DataFrame, specs: 'GCDExperimentSpecs') -> pd.DataFrame:
         """
         Unifies the data by combining the time, current, and potential columns.
@@ -139,70 +250,174 @@ class UnifiedDataGCD:
         Returns:
             pd.DataFrame: The unified data.
         """
-        if specs.cycle_separated and specs.level_separated:
-            dfs = []
-            for i in range(data.shape[1] // 2):
-                df = pd.DataFrame({
-                    'Time / s': data.iloc[:, 2*i],
-                    'Current / A': specs.level_current[(i % specs.level_number)],
-                    'Potential / V': data.iloc[:, 2*i+1]
-                })
-                dfs.append(df)
-            return pd.concat(dfs, axis=1)
+        if not self.is_unifiable(specs):
+            return pd.DataFrame()
+        return self.to_frame(self.interleave_levels(data.to_numpy(), specs), data.index)
+
+    def build_unified(self, raw_data: pd.DataFrame, specs: 'GCDExperimentSpecs') -> np.ndarray:
+        """
+        Converts the raw data to SI units and unifies it in a single pass.
+
+        Same values as unify_data(convert_to_si_units(raw_data), specs), but every raw value is read once
+        and written straight into its time/current/potential slot without an intermediate DataFrame.
+
+        Args:
+            raw_data (pd.DataFrame): The raw data to be processed and unified.
+            specs (GCDExperimentSpecs): The specifications for the GCD experiment.
+
+        Returns:
+            np.ndarray: The unified data, shape (rows, 3*levels).
+        """
+        if not self.is_unifiable(specs):
+            return np.empty((0, 0), dtype=self.precision)
+
+        return self.interleave_levels(
+            self.numeric_array(raw_data),
+            specs,
+            multipliers=self.si_multipliers()
+        )
+
+    def interleave_levels(
+        self,
+        arr: np.ndarray,
+        specs: 'GCDExperimentSpecs',
+        multipliers: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Stripes (time, potential) column pairs into (time, current, potential) triplets in one preallocated array.
+
+        Args:
+            arr (np.ndarray): Time and potential columns, alternating.
+            specs (GCDExperimentSpecs): The specifications for the GCD experiment.
+            multipliers (np.ndarray, optional): Per-column multipliers applied while copying.
+
+        Returns:
+            np.ndarray: The unified data, shape (rows, 3*levels).
+        """
+        levels: int = arr.shape[1] // 2
+        unified: np.ndarray = np.empty((arr.shape[0], 3*levels), dtype=self.precision)
+        if multipliers is None:
+            unified[:, 0::3] = arr[:, 0:2*levels:2]
+            unified[:, 2::3] = arr[:, 1:2*levels:2]
         else:
+            np.multiply(arr[:, 0:2*levels:2], multipliers[0:2*levels:2], out=unified[:, 0::3])
+            np.multiply(arr[:, 1:2*levels:2], multipliers[1:2*levels:2], out=unified[:, 2::3])
+        unified[:, 1::3] = specs.level_current_np[np.arange(levels) % specs.level_number]
+        return unified
+
+    @staticmethod
+    def to_frame(unified: np.ndarray, index: pd.Index) -> pd.DataFrame:
+        """
+        Wraps a unified array in a DataFrame with the time/current/potential column names.
+
+        Args:
+            unified (np.ndarray): The unified data, shape (rows, 3*levels).
+            index (pd.Index): Row index of the unified data.
+
+        Returns:
+            pd.DataFrame: The unified data.
+        """
+        if unified.shape[1] == 0:
             return pd.DataFrame()
+        return pd.DataFrame(
+            unified,
+            index=index,
+            columns=['Time / s', 'Current / A', 'Potential / V'] * (unified.shape[1] // 3),
+            copy=False
+        )
     
 
-def CalculaterForBattery(unified_data, specs):
+def iter_level_results(unified_data, specs):
     """
-    Calculate battery properties based on unified data and specifications.
+    Calculate battery properties level by level, so a consumer can handle one level before the next is built.
 
     Parameters:
     - unified_data: The unified data containing time, current, and potential values.
     - specs: The specifications of the battery.
 
-    Returns:
-    - dataframes: A list of dataframes containing calculated battery properties.
-    - levels_info: A list of dictionaries containing information about each level of the battery.
+    Yields:
+    - (level_informations, dataframe): Information about one level and its calculated battery properties.
 
     """
     mass = specs.material_mass
-    data = unified_data.unified_data
-    new_df = pd.DataFrame()
-    levels_info = []
-    dataframes = []
-    for i in range(data.shape[1]//3):
-        dummy = pd.DataFrame()
-        dummy['Time / s']       = data.iloc[:,3*i]
-        dummy['Current / A']    = data.iloc[:,3*i+1]
-        dummy['Potential / V']  = data.iloc[:, 3*i+2]
-        dummy['Specific Capacity / mAh/g'] = abs((dummy['Time / s'] / 3600) * (dummy['Current / A'] * 1000) 
-                                                 / (mass))
-        dummy['Energy Density / Wh/kg'] = abs(cumulative_trapezoid(
-                                                               dummy['Specific Capacity / mAh/g'],
-                                                               x=dummy['Potential / V'],
-                                                               initial=0
-                                                               ))
-        dummy['Power Density / W/kg'] = dummy['Energy Density / Wh/kg'] / (dummy['Time / s'] / 3600)
+    # Loop invariant: h = 3600 s, mA = 1E-3 A, per gram of active material
+    capacity_factor = 1000 / (3600 * mass)
+    # The unified buffer is used as is, no DataFrame is built around it
+    arr = unified_data.unified_array
+    index = unified_data.index
+    levels = arr.shape[1]//3
+    if levels == 0:
+        return
+    time        = arr[:, 0:3*levels:3]
+    current     = arr[:, 1:3*levels:3]
+    potential   = arr[:, 2:3*levels:3]
+    # All levels go through the kernel together, shape (rows, levels)
+    specific_capacity, energy_density, power_density = battery_quantities(time, current, potential, capacity_factor)
+    # Power density is NaN wherever time is missing, at 0 / 0, and from the first missing current or potential
+    # on, since energy density stays NaN. Energy density is forced to 0 in the first row, so there a missing
+    # current or potential does not reach power density and is checked directly
+    valid_rows = ~np.isnan(power_density)
+    valid_rows[:1] &= ~(np.isnan(current[:1]) | np.isnan(potential[:1]))
+    names = [
+        'Time / s',
+        'Current / A',
+        'Potential / V',
+        'Specific Capacity / mAh/g',
+        'Energy Density / Wh/kg',
+        'Power Density / W/kg'
+    ]
+    quantities = (time, current, potential, specific_capacity, energy_density, power_density)
+    dtype = np.result_type(*quantities)
+    for i in range(levels):
+        valid = valid_rows[:, i]
+        rows = np.count_nonzero(valid)
+        # Levels without a missing row are copied by slicing, only the others need the boolean gather
+        take = slice(None) if rows == len(valid) else valid
+        # One (rows, 6) block per level, wrapped without a consolidation copy. Column-major, so every
+        # column is filled contiguously and matches the (columns, rows) layout pandas keeps internally
+        block = np.empty((rows, len(names)), dtype=dtype, order='F')
+        for j, quantity in enumerate(quantities):
+            block[:, j] = quantity[take, i]
+        dummy = pd.DataFrame(block, index=index[take], columns=names, copy=False)
 
-        
-        dummy = dummy.dropna()
-        
-        
+        # Last values are read from the block, not through pandas scalar access
+        if rows:
+            last = block[-1]
+        else:
+            # No valid row in this level, the summary cells are left empty
+            last = [None] * len(names)
         level_informations = {
             'ID'                        : i+1,
             'Cycle'                     : i//specs.level_number + 1,
             'Level'                     : i % specs.level_number + 1,
-            'Current / A'               : dummy['Current / A'].iloc[-1],
-            'Time / s'                  : dummy['Time / s'].iloc[-1],
-            'Specific Capacity / mAh/g' : dummy['Specific Capacity / mAh/g'].iloc[-1],
-            'Energy Density / Wh/kg'    : dummy['Energy Density / Wh/kg'].iloc[-1],
-            'Power Density / W/kg'      : dummy['Power Density / W/kg'].iloc[-1]
+            'Current / A'               : specs.level_current_np[i % specs.level_number],
+            'Time / s'                  : last[0],
+            'Specific Capacity / mAh/g' : last[3],
+            'Energy Density / Wh/kg'    : last[4],
+            'Power Density / W/kg'      : last[5]
         }
 
         
+        yield level_informations, dummy
+
+
+def CalculaterForBattery(unified_data, specs):
+    """
+    Calculate battery properties based on unified data and specifications.
+
+    Parameters:
+    - unified_data: The unified data containing time, current, and potential values.
+    - specs: The specifications of the battery.
+
+    Returns:
+    - dataframes: A list of dataframes containing calculated battery properties.
+    - levels_info: A list of dictionaries containing information about each level of the battery.
+
+    """
+    levels_info = []
+    dataframes = []
+    for level_informations, dummy in iter_level_results(unified_data, specs):
         dataframes.append(dummy)
-        
         levels_info.append(level_informations)
     
     
@@ -220,8 +435,10 @@ if __name__ == "__main__":
         level_separated=True
     )
 
+    # 'xlsx' for the downsampled workbook, 'table' for every row in one Parquet/CSV table
+    export_format = sys.argv[1] if len(sys.argv) > 1 else 'xlsx'
+
     imported_data = DataImport('./test.xlsx')
     data = UnifiedDataGCD(imported_data.data, specs)
 
-    df , list = CalculaterForBattery(data, specs)
-    DataExporterGCD(list, df, imported_data.file_name, number_of_rows=200)
\ No newline at end of file
+    list = ExportGCD(iter_level_results(data, specs), imported_data.file_name, export_format, number_of_rows=200)
\ No newline at end of file
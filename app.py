@@ -7,6 +7,10 @@ from wtforms import *
 from wtforms.validators import *
 from GCD import *
 
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 from DataIO import *
 
@@ -43,8 +47,52 @@ class GCDExperimentSpecsForm(FlaskForm):
                             )
     material_mass = FloatField('Material Mass (Unit: Gram)',
                                validators=[DataRequired()])
+    export_format = RadioField(label='Export Format',
+                               choices=[('xlsx', 'Excel (sampled)'), ('table', 'Table (all rows)')],
+                               default='xlsx'
+                               )
     submit = SubmitField('Submit')
 
+# Level summaries of recent analyses, keyed on file content and experiment settings, least recently used first
+RESULTS_CACHE = OrderedDict()
+RESULTS_CACHE_SIZE = 32
+RESULTS_CACHE_LOCK = threading.Lock()
+
+def results_stamp(path):
+    # Identifies one version of a written results file, another analysis of the same file overwrites it
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def analyse_gcd(path, specs, export_format='xlsx'):
+    digest = DataImport.content_digest(path)
+    key = (digest, specs.cache_key(), export_format)
+    file_name, _ = os.path.splitext(path)
+    results_path = export_path(file_name, export_format)
+    # The results file is written as a side effect, so a hit also needs the very file this entry wrote
+    with RESULTS_CACHE_LOCK:
+        entry = RESULTS_CACHE.get(key)
+        if entry is not None:
+            RESULTS_CACHE.move_to_end(key)
+    if entry is not None:
+        levels_info, stamp = entry
+        try:
+            if results_stamp(results_path) == stamp:
+                return levels_info
+        except OSError:
+            pass # Results file was deleted, analyse again
+
+    Imported_Data = DataImport(path, digest=digest)
+    data = UnifiedDataGCD(Imported_Data.data, specs)
+    # Levels are written to the results file one at a time, only their summaries are kept
+    levels_info = ExportGCD(iter_level_results(data, specs), Imported_Data.file_name, export_format, number_of_rows=200)
+
+    with RESULTS_CACHE_LOCK:
+        RESULTS_CACHE[key] = (levels_info, results_stamp(results_path))
+        RESULTS_CACHE.move_to_end(key)
+        while len(RESULTS_CACHE) > RESULTS_CACHE_SIZE:
+            RESULTS_CACHE.popitem(last=False)
+    return levels_info
+
 @app.route('/')
 def home():
     return render_template('home.html')
@@ -55,40 +103,22 @@ def gcd():
     if request.method == 'POST' and form.validate_on_submit():
         print('Started')
         GCD_Specs = GCDExperimentSpecs(level_number=form.level_number.data,
-                                      level_current= [float(x) for x in form.level_currents.data.split(',')],
-                                      level_time= [float(x) for x in form.level_times.data.split(',')],
+                                      # One conversion per list, raises ValueError on any malformed entry
+                                      level_current= np.array(form.level_currents.data.split(','), dtype=np.float64),
+                                      level_time= np.array(form.level_times.data.split(','), dtype=np.float64),
                                       material_mass=form.material_mass.data,
                                       cycle_separated=form.cycles_seperated.data,
                                       level_separated=form.levels_seperated
                                      )
-        Imported_Data = DataImport(form.raw_data.data)
-
-        data = UnifiedDataGCD(Imported_Data.data, GCD_Specs)
-        df , list = CalculaterForBattery(data, GCD_Specs)
-        
-        DataExporterGCD(list, df, Imported_Data.file_name, number_of_rows=200)
+        list = analyse_gcd(form.raw_data.data, GCD_Specs, form.export_format.data)
         print('Finished')
         dataframe = pd.DataFrame(list)
 
-        dataframe = dataframe.style.set_properties(**{
-            'text-align': 'center',
-        }).set_table_styles([{
-            'selector': 'tr:nth-child(even)',
-            'props': [('background-color', 'rgb(245 245 244)')]
-        }, {
-            'selector': 'tr:nth-child(odd)',
-            'props': [('background-color', 'rgb(214 211 209)')]
-        },
-        {
-            'selector': 'tr',
-            'props': [('border', 'solid'), ('padding', '4px 0 4px 0')]
-        },
-        {
-            'selector': 'td',
-            'props': [('padding', '0 16px 0 16px')]
-        }])
+        # Row colours and spacing come from the gcd-table rules in GCD.html
         dataframe = dataframe.to_html(justify='center',
                                       index=False,
+                                      classes='gcd-table',
+                                      border=0
                                       )
         return render_template('GCD.html', form=form, dataframe=dataframe)
     return render_template('GCD.html', form=form)